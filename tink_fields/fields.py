@@ -1,4 +1,4 @@
-from functools import lru_cache
+from threading import Lock
 from typing import Any, Callable, Dict, Optional
 from django.db import models
 from django.core.exceptions import FieldError, ImproperlyConfigured
@@ -6,13 +6,15 @@ from tink import (
     KeysetHandle,
     cleartext_keyset_handle,
     read_keyset_handle,
+    BinaryKeysetReader,
     JsonKeysetReader,
     aead,
 )
 from django.conf import settings
-from dataclasses import dataclass
 from os.path import exists
-from django.utils.encoding import force_bytes, force_str
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.functional import cached_property
 from django.db.backends.base.base import BaseDatabaseWrapper
 
 
@@ -24,14 +26,40 @@ __all__ = [
     "EncryptedIntegerField",
     "EncryptedDateField",
     "EncryptedDateTimeField",
+    "preload_keysets",
 ]
 
 
-@dataclass
+_aead_primitives: Dict[str, aead.Aead] = {}
+_keyset_lock = Lock()
+
+
+@receiver(setting_changed)
+def _clear_keyset_caches(setting: str, **kwargs) -> None:
+    """Forget loaded keysets when `TINK_FIELDS_CONFIG` is overridden"""
+    if setting == "TINK_FIELDS_CONFIG":
+        with _keyset_lock:
+            _aead_primitives.clear()
+
+
+def _default_aad_callback(field: models.Field) -> bytes:
+    return b""
+
+
 class KeysetConfig:
-    path: str
-    master_key_aead: Optional[aead.Aead] = None
-    cleartext: bool = False
+    __slots__ = ("path", "master_key_aead", "cleartext", "format")
+
+    def __init__(
+        self,
+        path: str,
+        master_key_aead: Optional[aead.Aead] = None,
+        cleartext: bool = False,
+        format: str = "json",
+    ):
+        self.path = path
+        self.master_key_aead = master_key_aead
+        self.cleartext = cleartext
+        self.format = format
 
     def validate(self):
         if not self.path:
@@ -39,88 +67,133 @@ class KeysetConfig:
 
         if not exists(self.path):
             raise ImproperlyConfigured(f"Keyset {self.path} does not exist")
-        
+
+        if self.format not in ("json", "binary"):
+            raise ImproperlyConfigured(
+                f"Keyset format must be `json` or `binary`, not `{self.format}`"
+            )
+
         if not self.cleartext and self.master_key_aead is None:
             raise ImproperlyConfigured(f"Encrypted keysets must specify `master_key_aead`")
     
 
+def _get_config() -> Dict[str, Any]:
+    config = getattr(settings, "TINK_FIELDS_CONFIG", None)
+    if config is None:
+        raise ImproperlyConfigured(
+            f"Could not find `TINK_FIELDS_CONFIG` attribute in settings"
+        )
+    return config
+
+
+def _get_keyset_config(keyset: str) -> KeysetConfig:
+    """Return the validated configuration of the requested keyset"""
+    config = _get_config()
+    if keyset not in config:
+        raise ImproperlyConfigured(
+            f"Could not find configuration for keyset `{keyset}` in `TINK_FIELDS_CONFIG`"
+        )
+
+    keyset_config = KeysetConfig(**config[keyset])
+    keyset_config.validate()
+    return keyset_config
+
+
+def _load_keyset_handle(keyset: str) -> KeysetHandle:
+    """Read the requested keyset and return a respective keyset handle"""
+    keyset_config = _get_keyset_config(keyset)
+
+    try:
+        with open(keyset_config.path, "rb") as f:
+            serialized_keyset = f.read()
+    except FileNotFoundError:
+        # The keyset may have been removed since it was validated.
+        raise ImproperlyConfigured(f"Keyset {keyset_config.path} does not exist")
+
+    if keyset_config.format == "binary":
+        reader = BinaryKeysetReader(serialized_keyset)
+    else:
+        reader = JsonKeysetReader(serialized_keyset.decode("utf-8"))
+
+    if keyset_config.cleartext:
+        return cleartext_keyset_handle.read(reader)
+    return read_keyset_handle(reader, keyset_config.master_key_aead)
+
+
+def _get_keyset_primitive(keyset: str) -> aead.Aead:
+    """Return the AEAD primitive for the requested keyset, loading it at most once per process"""
+    primitive = _aead_primitives.get(keyset)
+    if primitive is None:
+        with _keyset_lock:
+            primitive = _aead_primitives.get(keyset)
+            if primitive is None:
+                primitive = _load_keyset_handle(keyset).primitive(aead.Aead)
+                _aead_primitives[keyset] = primitive
+    return primitive
+
+
 class EncryptedField(models.Field):
     """A field that uses Tink primitives to protect the confidentiality and integrity of data"""
 
-    _unsupported_properties = ["primary_key", "db_index", "unique"]
+    _unsupported_properties = frozenset(("primary_key", "db_index", "unique"))
     _internal_type = "BinaryField"
 
     _keyset: str
-    _keyset_handle: KeysetHandle
     _aad_callback: Callable[[models.Field], bytes]
 
     def __init__(self, *args, **kwargs):
-        for prop in EncryptedField._unsupported_properties:
-            if prop in kwargs:
-                raise ImproperlyConfigured(
-                    f"Field `{self.__class__.__name__}` does not support property `{prop}`"
-                )
-
-        self._keyset = kwargs.pop("keyset", "default")
-        self._keyset_handle = self._get_tink_keyset_handle()
-        self._aad_callback = kwargs.pop("aad_callback", lambda x: b"")
-
-        super(EncryptedField, self).__init__(*args, **kwargs)
-
-    def _get_config(self) -> Dict[str, Any]:
-        config = getattr(settings, "TINK_FIELDS_CONFIG", None)
-        if config is None:
+        unsupported = EncryptedField._unsupported_properties.intersection(kwargs)
+        if unsupported:
+            props = ", ".join(f"`{prop}`" for prop in sorted(unsupported))
             raise ImproperlyConfigured(
-                f"Could not find `TINK_FIELDS_CONFIG` attribute in settings"
+                f"Field `{self.__class__.__name__}` does not support property {props}"
             )
-        return config
-
-    def _get_tink_keyset_handle(self) -> KeysetHandle:
-        """Read the configuration for the requested keyset and return a respective keyset handle"""
-        config = self._get_config()
 
-        if self._keyset not in config:
-            raise ImproperlyConfigured(
-                f"Could not find configuration for keyset `{self._keyset}` in `TINK_FIELDS_CONFIG`"
-            )
+        self._keyset = kwargs.pop("keyset", "default")
+        # Validate up front so misconfigurations surface when models load, even
+        # though the keyset itself is only read on first use.
+        _get_keyset_config(self._keyset)
 
-        keyset_config = KeysetConfig(**config[self._keyset])
-        keyset_config.validate()
+        self._aad_callback = kwargs.pop("aad_callback", _default_aad_callback)
 
-        with open(keyset_config.path, "r") as f:
-            reader = JsonKeysetReader(f.read())
-            if keyset_config.cleartext:
-                return cleartext_keyset_handle.read(reader)
-            return read_keyset_handle(reader, keyset_config.master_key_aead)
+        super(EncryptedField, self).__init__(*args, **kwargs)
 
-    @lru_cache(maxsize=None)
     def _get_aead_primitive(self) -> aead.Aead:
-        return self._keyset_handle.primitive(aead.Aead)
+        return _get_keyset_primitive(self._keyset)
+
+    def _get_aad(self) -> bytes:
+        """Return the associated data, calling back for every value unless it is the default"""
+        if self._aad_callback is _default_aad_callback:
+            return b""
+        return self._aad_callback(self)
 
     def get_internal_type(self) -> str:
         return self._internal_type
 
     def get_db_prep_save(self, value: Any, connection: BaseDatabaseWrapper) -> Any:
+        if value is None:
+            return None
+
         val = super(EncryptedField, self).get_db_prep_save(value, connection)
         if val is not None:
+            # Integers and backend-native dates are serialized as text so that
+            # `from_db_value` can always decode UTF-8.
+            if not isinstance(val, str):
+                val = str(val)
             return connection.Database.Binary(
-                self._get_aead_primitive().encrypt(
-                    force_bytes(val), self._aad_callback(self)
-                )
+                self._get_aead_primitive().encrypt(val.encode("utf-8"), self._get_aad())
             )
 
     def from_db_value(self, value, expression, connection, *args):
         if value is not None:
-            return self.to_python(
-                force_str(
-                    self._get_aead_primitive().decrypt(
-                        bytes(value), self._aad_callback(self)
-                    )
-                )
-            )
-
-    @property
-    @lru_cache(maxsize=None)
+            # Tink only accepts `bytes`; most drivers already hand those back,
+            # while others (e.g. psycopg2) return a `memoryview` that must be copied.
+            if type(value) is not bytes:
+                value = bytes(value)
+            plaintext = self._get_aead_primitive().decrypt(value, self._get_aad())
+            return self.to_python(plaintext.decode("utf-8"))
+
+    @cached_property
     def validators(self):
         # Temporarily pretend to be whatever type of field we're masquerading
         # as, for purposes of constructing validators (needed for
@@ -134,6 +207,12 @@ class EncryptedField(models.Field):
             del self.__dict__["_internal_type"]
 
 
+def preload_keysets() -> None:
+    """Load every configured keyset so that the first query does not pay for it"""
+    for keyset in _get_config():
+        _get_keyset_primitive(keyset)
+
+
 def get_prep_lookup(self):
     """Raise errors for unsupported lookups"""
     raise FieldError(
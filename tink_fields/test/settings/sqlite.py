@@ -4,6 +4,7 @@ import os
 
 HERE = os.path.dirname(os.path.abspath(__file__))
 DB = os.path.join(HERE, "testdb.sqlite")
+KEYSET = os.path.join(HERE, "../test_plaintext_keyset.json")
 
 USE_TZ = False
 
@@ -20,10 +21,15 @@ DATABASES = {
 TINK_FIELDS_CONFIG = {
     "default": {
         "cleartext": True,
-        "path": os.path.join(HERE, "../test_plaintext_keyset.json"),
+        "path": KEYSET,
     },
     "alternate": {
         "cleartext": True,
-        "path": os.path.join(HERE, "../test_plaintext_keyset.json"),
+        "path": KEYSET,
+    },
+    "binary": {
+        "cleartext": True,
+        "format": "binary",
+        "path": os.path.join(HERE, "../test_plaintext_keyset.bin"),
     },
 }
@@ -1,12 +1,24 @@
 from datetime import date, datetime
 
+from django.core import validators
+from django.core.exceptions import ImproperlyConfigured
 from django.db import connection, models as dj_models
-from django.utils.encoding import force_bytes, force_str
 import pytest
+import tink
+from tink import aead, cleartext_keyset_handle
+
+import tink_fields as fields
 
 from . import models
 
 
+def _write_keyset(path):
+    """Write a freshly generated cleartext AEAD keyset to `path`."""
+    handle = tink.new_keyset_handle(aead.aead_key_templates.AES128_GCM)
+    with open(path, "w") as f:
+        cleartext_keyset_handle.write(tink.JsonKeysetWriter(f), handle)
+
+
 @pytest.mark.parametrize(
     "model,vals",
     [
@@ -28,16 +40,153 @@ class TestEncryptedFieldQueries(object):
         """Data stored in DB is actually encrypted."""
         field = model._meta.get_field("value")
         aad_callback = getattr(field, "_aad_callback")
-        model.objects.create(value=vals[0])
+        primitive = field._get_aead_primitive()
+        aad = aad_callback(field)
+        obj = model.objects.create(value=vals[0])
         with connection.cursor() as cur:
-            cur.execute("SELECT value FROM %s" % model._meta.db_table)
-            data = [
-                force_str(
-                    field._get_aead_primitive().decrypt(
-                        force_bytes(r[0]), aad_callback(field)
-                    )
-                )
-                for r in cur.fetchall()
-            ]
+            cur.execute(
+                "SELECT value FROM %s WHERE id = %%s" % model._meta.db_table, [obj.pk]
+            )
+            data = [primitive.decrypt(bytes(r[0]), aad).decode("utf-8") for r in cur]
 
         assert list(map(field.to_python, data)) == [vals[0]]
+
+
+def test_keyset_shared_across_fields():
+    """Fields using the same keyset share a single primitive."""
+    text = models.EncryptedText._meta.get_field("value")
+    char = models.EncryptedChar._meta.get_field("value")
+    alternate = models.EncryptedCharWithAlternateKeyset._meta.get_field("value")
+
+    assert text._get_aead_primitive() is char._get_aead_primitive()
+    assert text._get_aead_primitive() is not alternate._get_aead_primitive()
+
+
+def test_null_stored_as_null(db):
+    """NULL values are stored as SQL NULL rather than encrypted."""
+    models.EncryptedNullable.objects.create(value=None)
+    with connection.cursor() as cur:
+        cur.execute("SELECT value FROM %s" % models.EncryptedNullable._meta.db_table)
+        assert cur.fetchall() == [(None,)]
+
+    assert models.EncryptedNullable.objects.get().value is None
+
+
+def test_integer_validators():
+    """Validators are those of the masqueraded field type, built once per field."""
+    field = models.EncryptedInt._meta.get_field("value")
+
+    assert field.get_internal_type() == "BinaryField"
+    assert {type(v) for v in field.validators} == {
+        validators.MinValueValidator,
+        validators.MaxValueValidator,
+    }
+    assert field.validators is field.validators
+
+
+def test_keyset_loaded_lazily(settings, tmp_path):
+    """Constructing a field does not read its keyset until it is first used."""
+    path = tmp_path / "keyset.json"
+    _write_keyset(path)
+    settings.TINK_FIELDS_CONFIG = {"lazy": {"cleartext": True, "path": str(path)}}
+    field = fields.EncryptedTextField(keyset="lazy")
+    path.unlink()
+
+    with pytest.raises(ImproperlyConfigured, match="does not exist"):
+        field._get_aead_primitive()
+
+
+def test_missing_keyset_file(settings, tmp_path):
+    """A keyset path that does not exist is reported when the field is constructed."""
+    settings.TINK_FIELDS_CONFIG = {
+        "missing": {"cleartext": True, "path": str(tmp_path / "missing.json")},
+    }
+
+    with pytest.raises(ImproperlyConfigured, match="does not exist"):
+        fields.EncryptedTextField(keyset="missing")
+
+
+def test_keyset_removed_from_config(settings):
+    """A keyset dropped from the settings after construction is reported on use."""
+    settings.TINK_FIELDS_CONFIG = {"gone": settings.TINK_FIELDS_CONFIG["default"]}
+    field = fields.EncryptedTextField(keyset="gone")
+    settings.TINK_FIELDS_CONFIG = {}
+
+    with pytest.raises(ImproperlyConfigured, match="Could not find configuration"):
+        field._get_aead_primitive()
+
+
+def test_invalid_keyset_config(settings):
+    """Keyset configurations are validated when the field is constructed."""
+    path = settings.TINK_FIELDS_CONFIG["default"]["path"]
+    settings.TINK_FIELDS_CONFIG = {
+        "encrypted": {"path": path},
+        "unknown": {"cleartext": True, "format": "yaml", "path": path},
+    }
+
+    with pytest.raises(ImproperlyConfigured, match="master_key_aead"):
+        fields.EncryptedTextField(keyset="encrypted")
+    with pytest.raises(ImproperlyConfigured, match="format"):
+        fields.EncryptedTextField(keyset="unknown")
+
+
+def test_keyset_config_override(settings, tmp_path):
+    """Fields already in use pick up a keyset override, like newly built ones."""
+    field = models.EncryptedText._meta.get_field("value")
+    original = field._get_aead_primitive()
+
+    path = tmp_path / "keyset.json"
+    _write_keyset(path)
+    settings.TINK_FIELDS_CONFIG = {
+        **settings.TINK_FIELDS_CONFIG,
+        "default": {"cleartext": True, "path": str(path)},
+    }
+
+    primitive = field._get_aead_primitive()
+    assert primitive is fields.EncryptedTextField()._get_aead_primitive()
+    with pytest.raises(tink.TinkError):
+        original.decrypt(primitive.encrypt(b"foo", b""), b"")
+
+
+def test_preload_keysets(settings, tmp_path):
+    """Preloaded keysets are not read again on first use."""
+    path = tmp_path / "keyset.json"
+    _write_keyset(path)
+    settings.TINK_FIELDS_CONFIG = {"preloaded": {"cleartext": True, "path": str(path)}}
+    field = fields.EncryptedTextField(keyset="preloaded")
+
+    fields.preload_keysets()
+    path.unlink()
+
+    ciphertext = bytes(field.get_db_prep_save("foo", connection))
+    assert field.from_db_value(ciphertext, None, connection) == "foo"
+
+
+def test_binary_keyset():
+    """A binary keyset holding the same key decrypts what the JSON keyset encrypted."""
+    json_field = models.EncryptedText._meta.get_field("value")
+    binary_field = fields.EncryptedTextField(keyset="binary")
+
+    ciphertext = json_field._get_aead_primitive().encrypt(b"foo", b"")
+    assert binary_field._get_aead_primitive().decrypt(ciphertext, b"") == b"foo"
+
+
+def test_unsupported_properties():
+    """All unsupported properties are reported at once."""
+    with pytest.raises(ImproperlyConfigured, match="`db_index`, `unique`"):
+        fields.EncryptedCharField(max_length=25, unique=True, db_index=True)
+
+
+def test_aad_callback_called_per_value():
+    """A custom AAD callback is evaluated for every value, not cached on the field."""
+    state = {"aad": b"tenant-a"}
+    field = fields.EncryptedTextField(aad_callback=lambda f: state["aad"])
+    primitive = field._get_aead_primitive()
+
+    first = bytes(field.get_db_prep_save("foo", connection))
+    state["aad"] = b"tenant-b"
+    second = bytes(field.get_db_prep_save("bar", connection))
+
+    assert primitive.decrypt(first, b"tenant-a") == b"foo"
+    assert primitive.decrypt(second, b"tenant-b") == b"bar"
+    assert field.from_db_value(second, None, connection) == "bar"